@@ -6,6 +6,7 @@ import yaml
 from jsonschema import Draft7Validator
 
 from .yaml import load_yaml
+from .dumprule import _compile_re
 
 logger = logging.getLogger("seldump.config")
 
@@ -87,7 +88,7 @@ def _get_rule_errors(obj, filename):
 
     if isinstance(obj.get("names"), str):
         try:
-            re.compile(obj["names"], re.VERBOSE)
+            _compile_re(obj["names"])
         except re.error as e:
             msg = "names: not a valid regular expression: %s" % e
             loc = location_from_attribs(obj, "names")
@@ -100,7 +101,7 @@ def _get_rule_errors(obj, filename):
 
     if isinstance(obj.get("schemas"), str):
         try:
-            re.compile(obj["schemas"], re.VERBOSE)
+            _compile_re(obj["schemas"])
         except re.error as e:
             msg = "schemas: not a valid regular expression: %s" % e
             loc = location_from_attribs(obj, "schemas")
@@ -7,12 +7,21 @@ This file is part of pg_seldump.
 """
 
 import re
+import sys
 import logging
 from functools import lru_cache
 
 logger = logging.getLogger("seldump.dumprule")
 
 
+@lru_cache(maxsize=512)
+def _compile_re(pattern):
+    """
+    Compile a rule regular expression, reusing patterns already seen.
+    """
+    return re.compile(pattern, re.VERBOSE)
+
+
 class DumpRule:
     """
     Dump configuration of a set of database objects
@@ -50,34 +59,40 @@ class DumpRule:
             names = [name]
 
         if names is None:
-            self.names = set()
+            self.names = frozenset()
             self.names_re = None
         elif isinstance(names, list):
-            self.names = set(names)
+            self.names = frozenset(map(sys.intern, names))
             self.names_re = None
         else:
-            self.names = set()
-            self.names_re = re.compile(names, re.VERBOSE)
+            self.names = frozenset()
+            self.names_re = _compile_re(sys.intern(names))
 
         if schema is not None:
             schemas = [schema]
 
         if schemas is None:
-            self.schemas = set()
+            self.schemas = frozenset()
             self.schemas_re = None
         elif isinstance(schemas, list):
-            self.schemas = set(schemas)
+            self.schemas = frozenset(map(sys.intern, schemas))
             self.schemas_re = None
         else:
-            self.schemas = set()
-            self.schemas_re = re.compile(schemas, re.VERBOSE)
+            self.schemas = frozenset()
+            self.schemas_re = _compile_re(sys.intern(schemas))
 
         if kind is not None:
             kinds = [kind]
-        self.kinds = set(kinds or ())
+        self.kinds = frozenset(kinds or ())
 
         self.adjust_score = adjust_score
 
+        # Return True if a db object matches the rule
+        self.match = self._make_matcher()
+
+        # The score of the rule: the higher the stronger
+        self.score = self._get_score()
+
         # Actions
         self.action = action
         self.no_columns = no_columns or []
@@ -100,12 +115,7 @@ class DumpRule:
         rv.lineno = getattr(cfg, "lineno", None)
         return rv
 
-    @property
-    @lru_cache(maxsize=1)
-    def score(self):
-        """
-        The score of the rule: the higher the stronger
-        """
+    def _get_score(self):
         score = self.adjust_score
         if self.names:
             score += 1000
@@ -124,28 +134,39 @@ class DumpRule:
         """
         Return the file name and line no where the rule was parsed.
         """
-        return "%s:%s" % (self.filename, self.lineno)
+        return f"{self.filename}:{self.lineno}"
 
-    def match(self, obj):
+    def _make_matcher(self):
         """
-        Return True if the db object *obj* matches the rule.
-        """
-        if self.names and obj.name not in self.names:
-            return False
-
-        if self.names_re is not None and not self.names_re.match(obj.name):
-            return False
-
-        if self.schemas and obj.schema not in self.schemas:
-            return False
-
-        if self.schemas_re is not None and not self.schemas_re.match(obj.schema):
-            return False
-
-        if self.kinds and obj.kind not in self.kinds:
-            return False
+        Return a function `f(obj)` returning True if *obj* matches the rule.
 
-        return True
+        The function is generated to include only the tests for the selectors
+        specified in the rule, cheapest tests first.
+        """
+        clauses = []
+        if self.kinds:
+            clauses.append("obj.kind in K")
+        if self.schemas:
+            clauses.append("obj.schema in S")
+        if self.names:
+            clauses.append("obj.name in N")
+        if self.schemas_re is not None:
+            clauses.append("SR(obj.schema) is not None")
+        if self.names_re is not None:
+            clauses.append("NR(obj.name) is not None")
+
+        src = "def match(obj, K=K, S=S, N=N, SR=SR, NR=NR):\n    return %s\n" % (
+            " and ".join(clauses) or "True"
+        )
+        ns = {
+            "K": self.kinds,
+            "S": self.schemas,
+            "N": self.names,
+            "SR": self.schemas_re.match if self.schemas_re is not None else None,
+            "NR": self.names_re.match if self.names_re is not None else None,
+        }
+        exec(src, ns)
+        return ns["match"]
 
 
 class RuleMatch:
@@ -181,10 +202,7 @@ class RuleMatch:
         rv.filter = rule.filter
         if rule.action == DumpRule.ACTION_ERROR:
             if rule.filename and rule.lineno:
-                msg = "the object matches the error rule at %s:%s" % (
-                    rule.filename,
-                    rule.lineno,
-                )
+                msg = f"the object matches the error rule at {rule.pos}"
             else:
                 msg = "the object matches an error rule"
 
@@ -5,9 +5,8 @@ Writing to a dump file.
 This file is part of pg_seldump.
 """
 
-import math
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 
 import psycopg
 from psycopg import sql
@@ -24,10 +23,16 @@ class DumpWriter(Writer):
         self.outfile = outfile
         self.reader = reader
 
+        # Only measure the size of the tables copied if we can
+        self._seekable = outfile.seekable()
+
         self._start_time = None
         self._copy_start_pos = None
         self._copy_size = None
 
+        # Chunks of output waiting to be written to outfile
+        self._buf = []
+
     def dump_table(self, table, match):
         logger.info("writing %s %s", table.kind, table)
 
@@ -65,6 +70,7 @@ class DumpWriter(Writer):
         stmt = self.reader.obj_as_string(match.copy_statement)
         logger.debug("exporting using: %s", stmt)
 
+        self._flush()
         self._begin_copy()
         try:
             self.reader.copy(stmt, self.outfile)
@@ -74,6 +80,7 @@ class DumpWriter(Writer):
         else:
             self.write("\\.\n")
 
+        self._flush()
         self._end_copy()
 
     def dump_sequence(self, seq, match):
@@ -81,12 +88,11 @@ class DumpWriter(Writer):
 
         # Escape the sequence as identifier then as string to make a value
         # good for regclass
-        name = sql.Literal(self.reader.obj_as_string(seq.ident))
-        val = sql.Literal(self.reader.get_sequence_value(seq))
-        stmt = sql.SQL("\nselect pg_catalog.setval({}, {}, true);\n\n").format(
-            name, val
+        name = self.reader.obj_as_string(
+            sql.Literal(self.reader.obj_as_string(seq.ident))
         )
-        self.write(stmt)
+        val = self.reader.get_sequence_value(seq)
+        self.write("\nselect pg_catalog.setval(%s, %d, true);\n\n" % (name, val))
 
     def dump_materialized_view(self, matview, match):
         logger.info("writing %s %s", matview.kind, matview)
@@ -97,20 +103,24 @@ class DumpWriter(Writer):
         self.write("-- PostgreSQL data dump generated by pg_seldump %s\n" % VERSION)
         self.write("-- %s\n\n" % PROJECT_URL)
 
-        self._start_time = now = datetime.utcnow()
-        self.write("-- Data dump started at %sZ\n\n" % now)
+        self._start_time = now = datetime.now(timezone.utc)
+        self.write("-- Data dump started at %s\n\n" % now.isoformat(timespec="seconds"))
 
         self.write("set session authorization default;\n")
 
     def end_dump(self):
         self.write("\n\nanalyze;\n\n")
 
-        now = datetime.utcnow()
+        now = datetime.now(timezone.utc)
         elapsed = pretty_timedelta(now - self._start_time)
-        self.write("-- Data dump finished at %sZ (%s)\n\n" % (now, elapsed))
+        self.write(
+            "-- Data dump finished at %s (%s)\n\n"
+            % (now.isoformat(timespec="seconds"), elapsed)
+        )
 
         # No highlight please
         self.write("-- vim: set filetype=:\n")
+        self._flush()
 
     def write(self, data):
         if isinstance(data, sql.Composable):
@@ -119,7 +129,15 @@ class DumpWriter(Writer):
         if isinstance(data, str):
             data = data.encode("utf8")
 
-        self.outfile.write(data)
+        self._buf.append(data)
+
+    def _flush(self):
+        """
+        Write to the output file the data accumulated by `write()`.
+        """
+        if self._buf:
+            self.outfile.write(b"".join(self._buf))
+            self._buf.clear()
 
     def _begin_copy(self):
         """
@@ -127,7 +145,9 @@ class DumpWriter(Writer):
 
         Memorize where we are in the file output file, if the file is seekable.
         """
-        if self.outfile.seekable():
+        # Use tell(), not os.lseek() on the file descriptor: the latter would
+        # not account for the data still pending in a buffered writer.
+        if self._seekable:
             self._copy_start_pos = self.outfile.tell()
 
     def _end_copy(self):
@@ -136,7 +156,7 @@ class DumpWriter(Writer):
 
         If the file is seekable return the amout of bytes copied.
         """
-        if self.outfile.seekable() and self._copy_start_pos is not None:
+        if self._seekable and self._copy_start_pos is not None:
             self._copy_size = self.outfile.tell() - self._copy_start_pos
             self._copy_start_pos = None
 
@@ -150,9 +170,8 @@ def pretty_size(size):
         return "%sB" % size
 
     suffixes = ("B", "KiB", "MiB", "GiB", "TiB", "PiB", "EiB", "ZiB", "YiB")
-    i = int(math.floor(math.log(size, 1024)))
-    p = math.pow(1024, i)
-    s = round(size / p, 2)
+    i = min((int(size).bit_length() - 1) // 10, len(suffixes) - 1)
+    s = round(size / (1 << (i * 10)), 2)
     return "%s %s" % (s, suffixes[i])
 
 
@@ -160,11 +179,18 @@ def pretty_timedelta(delta):
     """
     Display a time interval in a human friendly way
     """
-    rem, secs = divmod(abs(delta.total_seconds()), 60)
+    total = round(delta.total_seconds())
+    sign = "-" if total < 0 else ""
+    rem, secs = divmod(abs(total), 60)
     rem, mins = divmod(rem, 60)
     days, hours = divmod(rem, 24)
-    parts = [(days, "d"), (hours, "h"), (mins, "m"), (secs, "s")]
-    while parts and parts[0][0] == 0:
-        del parts[0]
-    sign = "-" if delta.total_seconds() < 0 else ""
-    return sign + " ".join("%.0f%s" % p for p in parts)
+
+    parts = []
+    if days:
+        parts.append("%sd" % days)
+    if hours or parts:
+        parts.append("%sh" % hours)
+    if mins or parts:
+        parts.append("%sm" % mins)
+    parts.append("%ss" % secs)
+    return sign + " ".join(parts)
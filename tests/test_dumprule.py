@@ -0,0 +1,46 @@
+import pytest
+
+from seldump.dbobjects import Table, Sequence
+from seldump.dumprule import DumpRule
+
+table = Table(1, "public", "table1")
+seq = Sequence(2, "public", "seq1")
+other = Table(3, "other", "thing")
+
+
+@pytest.mark.parametrize(
+    "rule, objs, score",
+    [
+        ({}, [table, seq, other], 0),
+        ({"adjust_score": 5}, [table, seq, other], 5),
+        ({"kind": "table"}, [table, other], 10),
+        ({"kinds": ["table", "sequence"]}, [table, seq, other], 10),
+        ({"schema": "public"}, [table, seq], 100),
+        ({"schemas": "^oth"}, [other], 50),
+        ({"name": "table1"}, [table], 1000),
+        ({"names": ["table1", "thing"]}, [table, other], 1000),
+        ({"names": "^t"}, [table, other], 500),
+        ({"kind": "table", "schema": "public"}, [table], 110),
+        ({"kind": "sequence", "schemas": "^pub"}, [seq], 60),
+        ({"schema": "public", "names": "^t"}, [table], 600),
+        ({"schemas": "^o", "names": "^t"}, [other], 550),
+        ({"names": ["table1", "seq1"], "schema": "public"}, [table, seq], 1100),
+        ({"kind": "table", "schemas": "^p", "names": "^t"}, [table], 560),
+        (
+            {"kind": "table", "schema": "public", "names": "^t", "adjust_score": -1},
+            [table],
+            609,
+        ),
+        (
+            {"kinds": ["table", "sequence"], "schemas": ["public"], "names": ["seq1"]},
+            [seq],
+            1110,
+        ),
+        ({"kind": "sequence", "schema": "other"}, [], 110),
+    ],
+)
+def test_match(rule, objs, score):
+    rule = DumpRule(**rule)
+    assert rule.score == score
+    for obj in [table, seq, other]:
+        assert rule.match(obj) is (obj in objs), obj
@@ -0,0 +1,117 @@
+import io
+from datetime import timedelta
+
+import pytest
+from psycopg import sql
+
+from seldump.dbobjects import Table, Sequence
+from seldump.dumprule import RuleMatch
+from seldump.dumpwriter import DumpWriter, pretty_size, pretty_timedelta
+
+
+class FakeReader:
+    """
+    A reader emitting canned COPY data, to use DumpWriter without a database.
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def obj_as_string(self, obj):
+        return obj.as_string(None)
+
+    def get_sequence_value(self, seq):
+        return 42
+
+    def copy(self, stmt, file):
+        for row in self.rows:
+            file.write(row)
+
+
+def write_dump(outfile, reader):
+    table = Table(1, "public", "table1")
+    match = RuleMatch(table)
+    match.import_statement = "\ncopy public.table1 (id) from stdin;\n"
+    match.copy_statement = sql.SQL("copy public.table1 (id) to stdout")
+
+    writer = DumpWriter(outfile=outfile, reader=reader)
+    writer.begin_dump()
+    writer.dump_table(table, match)
+    writer.dump_sequence(Sequence(2, "public", "seq1"), RuleMatch(table))
+    writer.end_dump()
+
+
+def dump_body(data):
+    """
+    Return the dump content between the header and the footer.
+    """
+    data = data.decode("utf8")
+    start = data.index("set session authorization default;\n")
+    end = data.index("\n\nanalyze;\n")
+    return data[start:end]
+
+
+def test_dump_table_order():
+    rows = [b"%d\n" % i for i in range(1000, 2000)]
+    f = io.BytesIO()
+    write_dump(f, FakeReader(rows))
+
+    assert dump_body(f.getvalue()) == (
+        "set session authorization default;\n"
+        '\nalter table "public"."table1" disable trigger all;\n'
+        "\ncopy public.table1 (id) from stdin;\n"
+        + "".join("%d\n" % i for i in range(1000, 2000))
+        + "\\.\n"
+        '\nalter table "public"."table1" enable trigger all;\n\n'
+        "-- 5003 bytes written for table public.table1 (4.89 KiB)\n\n"
+        '\nselect pg_catalog.setval(\'"public"."seq1"\', 42, true);\n\n'
+    )
+
+
+def test_dump_to_file(tmp_path):
+    rows = [b"%d\tsome data\n" % i for i in range(100000)]
+    fn = tmp_path / "dump.sql"
+    with open(fn, "wb") as f:
+        write_dump(f, FakeReader(rows))
+
+    bio = io.BytesIO()
+    write_dump(bio, FakeReader(rows))
+
+    body = dump_body(fn.read_bytes())
+    assert body == dump_body(bio.getvalue())
+    assert "-- 1588893 bytes written for table public.table1 (1.52 MiB)" in body
+
+
+@pytest.mark.parametrize(
+    "size, pretty",
+    [
+        (0, "0B"),
+        (1, "1.0 B"),
+        (1023, "1023.0 B"),
+        (1024, "1.0 KiB"),
+        (1536, "1.5 KiB"),
+        (1024 * 1024 - 1, "1024.0 KiB"),
+        (1024 * 1024, "1.0 MiB"),
+        (5 << 30, "5.0 GiB"),
+        (1 << 90, "1024.0 YiB"),
+    ],
+)
+def test_pretty_size(size, pretty):
+    assert pretty_size(size) == pretty
+
+
+@pytest.mark.parametrize(
+    "delta, pretty",
+    [
+        (timedelta(), "0s"),
+        (timedelta(microseconds=400000), "0s"),
+        (timedelta(seconds=5, microseconds=900000), "6s"),
+        (timedelta(seconds=59, microseconds=600000), "1m 0s"),
+        (timedelta(minutes=2, seconds=3), "2m 3s"),
+        (timedelta(hours=1, seconds=5), "1h 0m 5s"),
+        (timedelta(days=2, minutes=1), "2d 0h 1m 0s"),
+        (timedelta(seconds=-65), "-1m 5s"),
+    ],
+)
+def test_pretty_timedelta(delta, pretty):
+    assert pretty_timedelta(delta) == pretty
@@ -1,5 +1,10 @@
+from collections import deque
+
 from seldump.writer import Writer
 
+# Writer states: a writer can be closed either before starting or after ending
+NEW, STARTED, ENDED, CLOSED, CLOSED_UNUSED = range(5)
+
 
 class TestWriter(Writer):
     __test__ = False
@@ -8,41 +13,41 @@ class TestWriter(Writer):
         self.reset()
 
     def reset(self):
-        self.dump_started = False
-        self.dump_ended = False
-        self.closed = False
-        self.dumped = []
+        self._state = NEW
+        self.dumped = deque()
+
+    @property
+    def dump_started(self):
+        return self._state in (STARTED, ENDED, CLOSED)
+
+    @property
+    def dump_ended(self):
+        return self._state in (ENDED, CLOSED)
+
+    @property
+    def closed(self):
+        return self._state in (CLOSED, CLOSED_UNUSED)
 
     def begin_dump(self):
-        assert not self.dump_started
-        assert not self.dump_ended
-        assert not self.closed
-        self.dump_started = True
+        assert self._state == NEW
+        self._state = STARTED
 
     def end_dump(self):
-        assert self.dump_started
-        assert not self.dump_ended
-        assert not self.closed
-        self.dump_ended = True
+        assert self._state == STARTED
+        self._state = ENDED
 
     def dump_table(self, table, match):
-        assert self.dump_started
-        assert not self.dump_ended
-        assert not self.closed
+        assert self._state == STARTED
         self.dumped.append((table, match))
 
     def dump_sequence(self, seq, match):
-        assert self.dump_started
-        assert not self.dump_ended
-        assert not self.closed
+        assert self._state == STARTED
         self.dumped.append((seq, match))
 
     def dump_materialized_view(self, matview, match):
-        assert self.dump_started
-        assert not self.dump_ended
-        assert not self.closed
+        assert self._state == STARTED
         self.dumped.append((matview, match))
 
     def close(self):
-        assert self.dump_started == self.dump_ended
-        self.closed = True
+        assert self._state in (NEW, ENDED)
+        self._state = CLOSED if self._state == ENDED else CLOSED_UNUSED